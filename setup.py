@@ -0,0 +1,23 @@
+"""Optional native build of the schema parser.
+
+`python setup.py build_ext --inplace` compiles tf_schema_parser.py with mypyc (pip install mypy)
+into an extension module next to it, which Python then imports in preference to the .py file.
+Without mypyc installed the pure-Python module is used as-is.
+"""
+from setuptools import setup
+
+try:
+    from mypyc.build import mypycify
+    ext_modules = mypycify(['tf_schema_parser.py'])
+except ImportError:
+    ext_modules = []
+
+setup(
+    name='tf-schema-parser',
+    version='0.1.0',
+    description='Explore Terraform provider schemas and generate HCL templates',
+    python_requires='>=3.8',
+    py_modules=['tf_schema_parser'],
+    scripts=['tf-schema-parser.py'],
+    ext_modules=ext_modules,
+)
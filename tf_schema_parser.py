@@ -0,0 +1,431 @@
+"""Parses Terraform provider schema JSON and generates HCL templates.
+
+Kept separate from the tf-schema-parser.py CLI so it can be imported and, optionally,
+compiled to a native extension with mypyc (see setup.py).
+"""
+import json
+import functools
+import re
+import mmap
+import pickle
+from itertools import compress
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Pattern, Tuple
+
+# Schema dicts are the JSON objects from `terraform providers schema -json`
+Schema = Dict[str, Any]
+# Flattened template records, see TerraformSchemaParser._flatten_block
+Record = Tuple[Any, ...]
+
+_json_loads: Callable[[bytes], Any]
+
+# Optional faster JSON parsers for loading the (large) schema file - falls back to stdlib json
+try:
+    import orjson  # type: ignore
+    _json_loads = orjson.loads
+except ImportError:
+    try:
+        import ujson  # type: ignore
+        _json_loads = ujson.loads
+    except ImportError:
+        _json_loads = json.loads
+
+# Optional streaming parser - when its C backend is available only the provider subtree is materialized
+try:
+    import ijson  # type: ignore
+    HAS_STREAMING_JSON = getattr(ijson, 'backend_name', 'python') != 'python'
+except ImportError:
+    HAS_STREAMING_JSON = False
+
+# Precomputed indentation strings, indexed by nesting level
+_INDENTS = tuple('  ' * i for i in range(64))
+
+# Type rendering and placeholder lookups, keyed on the type's leading keyword
+_COLLECTION_TYPES = frozenset(('list', 'set', 'map'))
+_SIMPLIFIED_TYPES = {'object': 'object({...})', 'tuple': 'tuple([...])'}
+_PLACEHOLDER_EXACT = {'string': '""', 'bool': 'false', 'number': '0'}
+_PLACEHOLDER_PREFIX = {'list': '[]', 'set': '[]', 'map': '{}', 'object': '{}', 'tuple': '[]'}
+
+# Attribute names like `storage_account_name` / `subnet_id` reference another resource
+_REFERENCE_SUFFIX_RE = re.compile(r'(.*)_(name|id)\Z')
+
+# Byte patterns for locating a single resource in the raw schema file without parsing all of it
+_RESOURCE_SECTION_RE = re.compile(rb'"resource_schemas"\s*:\s*\{')
+_NEXT_SECTION_RE = re.compile(rb'"(?:data_source_schemas|ephemeral_resource_schemas|resource_identity_schemas'
+                              rb'|list_resource_schemas|action_schemas|functions|registry\.terraform\.io/[^"]*)"\s*:')
+_BRACE_TOKEN_RE = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"|[{}]', re.DOTALL)
+
+def _object_key_re(key: str) -> Pattern[bytes]:
+    # Only matches real keys: inside a JSON string the closing quote would be escaped
+    return re.compile(rb'"' + re.escape(key.encode()) + rb'"\s*:\s*\{')
+
+@functools.lru_cache(maxsize=64)
+def _compile_query(query: str) -> Callable[[str], Any]:
+    # Every whitespace-separated token must appear somewhere in the (lowercased) name
+    tokens = query.lower().split()
+    if len(tokens) <= 1:
+        return re.compile(re.escape(''.join(tokens))).search
+    return re.compile(''.join(f'(?=.*?{re.escape(token)})' for token in tokens)).match
+
+class TerraformSchemaParser:
+    def __init__(self, schema_path: str, lazy_resource: Optional[str] = None) -> None:
+        self.schema_path = Path(schema_path)
+        self.cache_path = self.schema_path.with_name(self.schema_path.name + '.cache.pkl')
+        self.provider = 'azurerm'  # Hardcoded for now, as per scope
+        self.resources: Dict[str, Schema] = {}
+        self.data_sources: Dict[str, Schema] = {}
+        self._name_index: Dict[bool, Tuple[List[str], List[str]]] = {}
+        self._sorted_cache: Dict[int, Tuple[Schema, Tuple[Tuple[str, Schema], ...]]] = {}
+        self._template_cache: Dict[Tuple[str, bool, bool, int], str] = {}
+        self._preorder: Dict[Tuple[str, int], List[Record]] = {}
+        self._load_schema(lazy_resource)
+
+    def _load_schema(self, lazy_resource: Optional[str] = None) -> None:
+        if not self.schema_path.exists():
+            raise FileNotFoundError(f"Schema file not found at {self.schema_path}. Run the bash script to download it.")
+
+        if lazy_resource and self._load_single_resource(lazy_resource):
+            self._build_name_index()
+            return
+
+        schema_stamp = self._schema_stamp()
+        if not self._load_cached_schema(schema_stamp):
+            provider_key = f'registry.terraform.io/hashicorp/{self.provider}'
+            if HAS_STREAMING_JSON:
+                provider_schema = self._stream_provider_schema(provider_key)
+            else:
+                schema_data = _json_loads(self.schema_path.read_bytes())
+                provider_schema = schema_data.get('provider_schemas', {}).get(provider_key)
+            if not provider_schema:
+                raise ValueError(f"No schema found for provider '{self.provider}' in the JSON file.")
+
+            self.resources = provider_schema.get('resource_schemas', {})
+            self.data_sources = provider_schema.get('data_source_schemas', {})
+
+            if not self.resources and not self.data_sources:
+                raise ValueError("No resources or data sources found in the schema.")
+
+            self._save_cached_schema(schema_stamp)
+
+        self._build_name_index()
+
+    def _load_single_resource(self, name: str) -> bool:
+        # Parses only the requested resource's JSON object, found by scanning the mmapped file.
+        # Returns False if it can't be located unambiguously so the caller does a full load.
+        try:
+            with open(self.schema_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                span = self._find_resource_span(mm, name)
+                if span is None:
+                    return False
+                schema = _json_loads(mm[span[0]:span[1]])
+        except (OSError, ValueError):
+            return False
+
+        # A nested block type with the same name would have nesting_mode
+        if not isinstance(schema, dict) or 'block' not in schema or 'nesting_mode' in schema:
+            return False
+        self.resources = {name: schema}
+        self.data_sources = {}
+        return True
+
+    def _find_resource_span(self, mm: mmap.mmap, name: str) -> Optional[Tuple[int, int]]:
+        providers = list(_object_key_re(f'registry.terraform.io/hashicorp/{self.provider}').finditer(mm))
+        if len(providers) != 1:
+            return None
+        section = _RESOURCE_SECTION_RE.search(mm, providers[0].end())
+        if not section:
+            return None
+        next_section = _NEXT_SECTION_RE.search(mm, section.end())
+        section_end = next_section.start() if next_section else len(mm)
+
+        matches = list(_object_key_re(name).finditer(mm, section.end(), section_end))
+        if len(matches) != 1:
+            return None
+
+        # Balanced-brace scan over string tokens and braces to find the end of the object
+        start = matches[0].end() - 1
+        depth = 0
+        for token in _BRACE_TOKEN_RE.finditer(mm, start, section_end):
+            char = mm[token.start()]
+            if char == ord('{'):
+                depth += 1
+            elif char == ord('}'):
+                depth -= 1
+                if depth == 0:
+                    return start, token.end()
+        return None
+
+    def _stream_provider_schema(self, provider_key: str) -> Schema:
+        # Other providers in the file are skipped by the parser instead of being built and discarded.
+        # ijson joins prefix components with '.', so the dotted registry key is matched verbatim.
+        with open(self.schema_path, 'rb') as f:
+            return dict(ijson.kvitems(f, f'provider_schemas.{provider_key}', use_float=True))
+
+    def _schema_stamp(self) -> Tuple[str, int, int]:
+        stat = self.schema_path.stat()
+        return (self.provider, stat.st_mtime_ns, stat.st_size)
+
+    def _load_cached_schema(self, schema_stamp: Tuple[str, int, int]) -> bool:
+        # Unpickling the provider subtree is much faster than re-parsing the JSON;
+        # the cache is only used if it was built from the current schema file
+        try:
+            stamp, resources, data_sources = pickle.loads(self.cache_path.read_bytes())
+        except Exception:
+            return False
+        if stamp != schema_stamp:
+            return False
+        self.resources = resources
+        self.data_sources = data_sources
+        return True
+
+    def _save_cached_schema(self, schema_stamp: Tuple[str, int, int]) -> None:
+        try:
+            self.cache_path.write_bytes(pickle.dumps((schema_stamp, self.resources, self.data_sources), protocol=5))
+        except OSError:
+            pass  # Caching is best-effort, e.g. the schema directory may be read-only
+
+    def _build_name_index(self) -> None:
+        # Sort and lowercase names once so searches don't redo it on every query
+        res_names = sorted(self.resources)
+        data_names = sorted(self.data_sources)
+        res_lower = [name.lower() for name in res_names]
+        data_lower = [name.lower() for name in data_names]
+        self._name_index = {
+            False: (res_names, res_lower),
+            True: (res_names + data_names, res_lower + data_lower),
+        }
+
+    def get_all_names(self, include_data: bool = False) -> List[str]:
+        return list(self._name_index[bool(include_data)][0])
+
+    def filter_names(self, query: str, include_data: bool = False) -> List[str]:
+        names, lower_names = self._name_index[bool(include_data)]
+        return list(compress(names, map(_compile_query(query), lower_names)))
+
+    def get_schema_block(self, name: str) -> Optional[Schema]:
+        if name in self.resources:
+            return self.resources[name].get('block', {})
+        elif name in self.data_sources:
+            return self.data_sources[name].get('block', {})
+        return None
+
+    def generate_hcl_template(self, name: str, with_descriptions: bool = True, required_only: bool = False,
+                              indent_level: int = 0) -> str:
+        # Templates are deterministic for a given schema, so repeat requests are served from cache
+        key = (name, with_descriptions, required_only, indent_level)
+        template = self._template_cache.get(key)
+        if template is None:
+            template = self._render_hcl_template(name, with_descriptions, required_only, indent_level)
+            self._template_cache[key] = template
+        return template
+
+    def _render_hcl_template(self, name: str, with_descriptions: bool, required_only: bool, indent_level: int) -> str:
+        block = self.get_schema_block(name)
+        if not block:
+            raise ValueError(f"No schema found for {name}")
+
+        is_resource = name in self.resources
+        block_type = "resource" if is_resource else "data"
+        label = name
+        instance_name = "example"
+
+        lines = [f'{block_type} "{label}" "{instance_name}" {{']
+        self._format_block_body(lines, self._get_preorder(name, block, indent_level + 1), with_descriptions, required_only=required_only)
+        lines.append('}' * (indent_level + 1))
+        return '\n'.join(lines)
+
+    def _get_preorder(self, name: str, block: Schema, indent_level: int) -> List[Record]:
+        # Each resource is flattened once, on first use, and shared by all template variants
+        key = (name, indent_level)
+        records = self._preorder.get(key)
+        if records is None:
+            records = self._preorder[key] = self._flatten_block(block, indent_level)
+        return records
+
+    def _flatten_block(self, block: Schema, indent_level: int) -> List[Record]:
+        # Flattens the nested block tree into a preorder list of records: ('attr', name, schema, indent_level),
+        # ('block', name, schema, indent_level, end), ('line', text), and ('repeat',) / ('repeat_end', count)
+        # around a block body to emit `count` times. `end` is the index just past the block's contents,
+        # so a block left out of required-only templates is skipped in one step.
+        records: List[Record] = []
+        stack = self._child_entries(block, indent_level)
+        stack.reverse()
+        pop = stack.pop
+        push = records.append
+        while stack:
+            entry = pop()
+            kind = entry[0]
+            if kind == 'block':
+                stack.append(('end', len(records)))
+                push(entry)
+                stack.extend(reversed(self._block_contents(entry[1], entry[2], entry[3])))
+            elif kind == 'end':
+                start = entry[1]
+                records[start] = records[start] + (len(records),)
+            else:
+                push(entry)
+        return records
+
+    def _format_block_body(self, lines: List[str], records: List[Record], with_descriptions: bool,
+                           required_only: bool = False) -> None:
+        # Single linear pass over the flattened records, no dict traversal of nested blocks
+        append = lines.append
+        format_attribute = self._format_attribute
+        format_block_type = self._format_block_type
+        repeat_starts: List[int] = []
+        index = 0
+        count = len(records)
+        while index < count:
+            record = records[index]
+            kind = record[0]
+            if kind == 'line':
+                append(record[1])
+            elif kind == 'attr':
+                format_attribute(lines, record[1], record[2], with_descriptions, record[3], required_only=required_only)
+            elif kind == 'repeat':
+                repeat_starts.append(len(lines))
+            elif kind == 'repeat_end':
+                lines.extend(lines[repeat_starts.pop():] * (record[1] - 1))
+            elif required_only and record[2].get('min_items', 0) == 0:
+                index = record[4]
+                continue
+            else:
+                format_block_type(lines, record[2], with_descriptions, record[3])
+            index += 1
+
+    def _child_entries(self, block: Schema, indent_level: int) -> List[Record]:
+        # Attributes then block types, each sorted alphabetically
+        entries = [('attr', name, schema, indent_level) for name, schema in self._sorted_items(block.get('attributes'))]
+        entries.extend(('block', name, schema, indent_level) for name, schema in self._sorted_items(block.get('block_types')))
+        return entries
+
+    def _sorted_items(self, mapping: Optional[Schema]) -> Tuple[Tuple[str, Schema], ...]:
+        # Schema dicts are never mutated after loading, so their sorted items can be
+        # memoized by identity; the dict itself is kept to guard against id reuse
+        if not mapping:
+            return ()
+        cached = self._sorted_cache.get(id(mapping))
+        if cached is None or cached[0] is not mapping:
+            cached = (mapping, tuple(sorted(mapping.items(), key=lambda x: x[0])))
+            self._sorted_cache[id(mapping)] = cached
+        return cached[1]
+
+    def _format_attribute(self, lines: List[str], name: str, schema: Schema, with_descriptions: bool, indent_level: int,
+                          required_only: bool = False) -> None:
+        if required_only and not schema.get('required', False):
+            return
+
+        indent = _INDENTS[indent_level] if indent_level < len(_INDENTS) else '  ' * indent_level
+        type_ = self._parse_type(schema.get('type'))
+        required = schema.get('required', False)
+        optional = schema.get('optional', False)
+        computed = schema.get('computed', False)
+        deprecated = schema.get('deprecated', False)
+        sensitive = schema.get('sensitive', False)
+        default = schema.get('default')
+        description = schema.get('description', '').strip() if with_descriptions else None
+
+        if deprecated:
+            return  # Skip deprecated for clean templates
+
+        status = 'required' if required else ('optional' if optional else 'computed')
+        comment_parts = [status, f"type: {type_}"]
+        if sensitive:
+            comment_parts.append("sensitive")
+        if default is not None:
+            comment_parts.append(f"default: {default}")
+        comment = "# " + ", ".join(comment_parts)
+        if description:
+            # Split long descriptions into multi-line comments
+            desc_lines = [f"{indent}# {line}" for line in description.splitlines() if line and not line.isspace()]
+            desc_lines.append(f"{indent}{comment}")
+            comment = '\n'.join(desc_lines)
+        else:
+            comment = f"  {comment}"
+
+        placeholder = self._get_placeholder(type_, attr_name=name, default=default)
+        line = f"{indent}{name} = {placeholder}"
+        if comment and not description:  # Inline comment if no desc
+            line += comment
+        elif comment:
+            lines.append(comment)
+        lines.append(line)
+
+    def _format_block_type(self, lines: List[str], schema: Schema, with_descriptions: bool, indent_level: int) -> None:
+        # Only the comment lines; the block's body and braces come from its flattened records
+        indent = _INDENTS[indent_level] if indent_level < len(_INDENTS) else '  ' * indent_level
+        nesting = schema.get('nesting_mode', 'single')
+        min_items = schema.get('min_items', 0)
+        max_items = schema.get('max_items', None)
+        description = schema.get('description', '').strip() if with_descriptions else None
+
+        comment_parts = [f"nesting: {nesting}", f"min: {min_items}"]
+        if max_items is not None:
+            comment_parts.append(f"max: {max_items}")
+        comment = "# " + ", ".join(comment_parts)
+        if description:
+            desc_lines = [f"{indent}# {line}" for line in description.splitlines() if line and not line.isspace()]
+            desc_lines.append(f"{indent}{comment}")
+            lines.extend(desc_lines)
+        else:
+            lines.append(f"{indent}# {comment}")
+
+    def _block_contents(self, name: str, schema: Schema, indent_level: int) -> List[Record]:
+        # Records following a block's comment lines: braces, child entries and placeholder lines
+        indent = _INDENTS[indent_level] if indent_level < len(_INDENTS) else '  ' * indent_level
+        nesting = schema.get('nesting_mode', 'single')
+        min_items = schema.get('min_items', 0)
+        max_items = schema.get('max_items', None)
+        block = schema.get('block', {})
+
+        contents: List[Record] = []
+        if nesting == 'single':
+            contents.append(('line', f"{indent}{name} {{"))
+            contents.extend(self._child_entries(block, indent_level + 1))
+            contents.append(('line', f"{indent}}}"))
+        elif nesting in ('list', 'set'):
+            repeat_parts = [f"min: {min_items}"]
+            if max_items:
+                repeat_parts.append(f"max: {max_items}")
+            contents.append(('line', f"{indent}# Repeat this block as needed ({', '.join(repeat_parts)})"))
+            if min_items > 0:
+                # The block is identical each time, so it is rendered once and the output repeated
+                contents.append(('repeat',))
+                contents.append(('line', f"{indent}{name} {{"))
+                contents.extend(self._child_entries(block, indent_level + 1))
+                contents.append(('line', f"{indent}}}"))
+                contents.append(('repeat_end', min_items))
+            else:
+                contents.append(('line', f"{indent}{name} {{  # optional, uncomment and fill if needed"))
+                contents.append(('line', f"{indent}  # ..."))
+                contents.append(('line', f"{indent}}}"))
+        elif nesting == 'map':
+            contents.append(('line', f"{indent}{name} = {{  # key = value syntax, repeat as needed"))
+            contents.append(('line', f"{indent}  example_key {{"))
+            contents.extend(self._child_entries(block, indent_level + 2))
+            contents.append(('line', f"{indent}  }}"))
+            contents.append(('line', f"{indent}}}"))
+        return contents
+
+    def _parse_type(self, type_: Any) -> str:
+        if isinstance(type_, str):
+            return type_
+        elif isinstance(type_, list):
+            kind = type_[0]
+            if kind in _COLLECTION_TYPES:
+                return f"{kind}({self._parse_type(type_[1])})"
+            return _SIMPLIFIED_TYPES.get(kind, 'unknown')  # object/tuple are simplified
+        return 'unknown'
+
+    def _get_placeholder(self, type_: str, attr_name: Optional[str] = None, default: Any = None) -> str:
+        if default is not None:
+            return json.dumps(default)
+        if attr_name:
+            match = _REFERENCE_SUFFIX_RE.match(attr_name)
+            if match:
+                resource_type, field = match.groups()
+                return f'azurerm_{resource_type}.example.{field}'
+        placeholder = _PLACEHOLDER_EXACT.get(type_)
+        if placeholder is not None:
+            return placeholder
+        return _PLACEHOLDER_PREFIX.get(type_.split('(', 1)[0], 'null')